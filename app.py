@@ -3,36 +3,66 @@ AI Animal Type Classification System
 Main Flask Application
 """
 
-import os
 import json
+import shutil
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+import cachetools
 from flask import Flask, render_template, request, jsonify, redirect, url_for, flash, send_from_directory
 from werkzeug.utils import secure_filename
 from dotenv import load_dotenv
-from datetime import datetime
 
 # Load environment variables
 load_dotenv()
 
 from config import Config
-from gemini_analyzer import GeminiAnalyzer
 from atc_scoring import ATCScorer
 from bpa_integration import BPAIntegration
+from report_store import ReportStore
+from json_provider import ORJSONProvider
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 app.config.from_object(Config)
 app.secret_key = Config.SECRET_KEY
 
 # Ensure upload folder exists
-os.makedirs(Config.UPLOAD_FOLDER, exist_ok=True)
+Config.UPLOAD_FOLDER.mkdir(parents=True, exist_ok=True)
 
 # Initialize components
 analyzer = None
 scorer = ATCScorer()
 bpa_client = BPAIntegration()
 
-# Store results in memory (in production, use database)
-analysis_results = {}
+
+def _remove_report_image(report_id, report):
+    """Delete the uploaded image of a report evicted from the store."""
+    image_path = report.get('image_path')
+    if image_path:
+        (Config.UPLOAD_FOLDER / image_path).unlink(missing_ok=True)
+
+
+# Recent results are cached in memory, all results are persisted to SQLite
+analysis_results = ReportStore(
+    Config.REPORT_DB_PATH,
+    cache_size=Config.REPORT_CACHE_SIZE,
+    max_entries=Config.REPORT_MAX_ENTRIES,
+    on_evict=_remove_report_image
+)
+
+# Gemini calls run in the background; pending jobs are tracked by report ID
+EXECUTOR = ThreadPoolExecutor(max_workers=Config.ANALYSIS_WORKERS)
+analysis_jobs = {}
+
+# Error messages of failed jobs, kept for a while so clients can poll them
+failed_jobs = cachetools.TTLCache(maxsize=1024, ttl=3600)
+failed_jobs_lock = threading.Lock()
+
+# Magic numbers of PNG and JPEG files (WebP is a RIFF container, checked separately)
+_IMAGE_SIGNATURES = (b'\x89PNG', b'\xff\xd8\xff')
 
 
 def allowed_file(filename):
@@ -41,10 +71,18 @@ def allowed_file(filename):
            filename.rsplit('.', 1)[1].lower() in Config.ALLOWED_EXTENSIONS
 
 
+def allowed_content(head):
+    """Check that the first bytes of a file match a supported image format."""
+    if head.startswith(b'RIFF') and head[8:12] == b'WEBP':
+        return True
+    return head.startswith(_IMAGE_SIGNATURES)
+
+
 def get_analyzer():
     """Get or initialize the Gemini analyzer."""
     global analyzer
     if analyzer is None:
+        from gemini_analyzer import GeminiAnalyzer
         try:
             analyzer = GeminiAnalyzer()
         except ValueError as e:
@@ -80,52 +118,102 @@ def upload_file():
     if not allowed_file(file.filename):
         return jsonify({'error': 'Invalid file type. Use PNG, JPG, JPEG, or WebP'}), 400
     
-    # Save the uploaded file
-    filename = secure_filename(file.filename)
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    filename = f"{timestamp}_{filename}"
-    filepath = os.path.join(Config.UPLOAD_FOLDER, filename)
-    file.save(filepath)
+    # Reject files whose content is not an image before copying them into uploads/.
+    # Werkzeug has already spooled the full request body by this point.
+    head = file.stream.read(12)
+    file.stream.seek(0)
+    if not allowed_content(head):
+        return jsonify({'error': 'File content is not a PNG, JPEG, or WebP image'}), 400
+    
+    # Refuse new work while the analysis queue is full
+    if len(analysis_jobs) >= Config.MAX_PENDING_JOBS:
+        return jsonify({'error': 'Server is busy analyzing other images. Please try again shortly.'}), 503
+    
+    # Save the uploaded file under its report ID so concurrent uploads never clash
+    report_id = scorer.new_report_id()
+    filename = f"{report_id}_{secure_filename(file.filename)}"
+    filepath = Config.UPLOAD_FOLDER / filename
+    with open(filepath, 'wb') as dst:
+        shutil.copyfileobj(file.stream, dst, length=Config.UPLOAD_CHUNK_SIZE)
     
     # Get analyzer
     gemini, error = get_analyzer()
     if error:
         # Remove uploaded file since we can't process it
-        os.remove(filepath)
+        filepath.unlink(missing_ok=True)
         return jsonify({'error': f'API Key Error: {error}. Please add your GEMINI_API_KEY to the .env file.'}), 400
     
     if gemini is None:
-        os.remove(filepath)
+        filepath.unlink(missing_ok=True)
         return jsonify({'error': 'Gemini API key not configured. Create a .env file with GEMINI_API_KEY=your_key'}), 400
     
+    # Queue the analysis and let the client poll for the result
+    job = EXECUTOR.submit(_run_analysis, gemini, filepath, filename, report_id)
+    analysis_jobs[report_id] = job
+    job.add_done_callback(partial(_forget_job, report_id))
+    
+    return jsonify({
+        'success': True,
+        'report_id': report_id,
+        'status': 'pending',
+        'status_url': url_for('get_status', report_id=report_id)
+    }), 202
+
+
+def _run_analysis(gemini, filepath, filename, report_id):
+    """Analyze an uploaded image and store the formatted report.
+    
+    Failures are logged, recorded in failed_jobs and their upload removed.
+    """
     try:
-        # Analyze the image
         print(f"[DEBUG] Analyzing image: {filepath}")
         result = gemini.analyze_image(filepath)
         print(f"[DEBUG] Analysis result: {result}")
         
         if result.get('error'):
-            return jsonify({'error': result.get('message', 'Analysis failed')}), 500
+            raise RuntimeError(result.get('message', 'Analysis failed'))
         
-        # Format the report
-        report = scorer.format_report(result)
+        # Format and store the report
+        report = scorer.format_report(result, report_id=report_id)
         report['image_path'] = filename
-        
-        # Store the result
-        report_id = report['report_id']
-        analysis_results[report_id] = report
-        
-        return jsonify({
-            'success': True,
-            'report_id': report_id,
-            'report': report
-        })
+        return analysis_results.setdefault(report_id, report)
         
     except Exception as e:
-        import traceback
-        print(f"[ERROR] Upload failed: {str(e)}")
+        print(f"[ERROR] Analysis failed: {str(e)}")
         print(traceback.format_exc())
-        return jsonify({'error': str(e)}), 500
+        filepath.unlink(missing_ok=True)
+        with failed_jobs_lock:
+            failed_jobs[report_id] = str(e)
+        return None
+
+
+def _forget_job(report_id, job):
+    """Drop a finished job from the pending jobs."""
+    analysis_jobs.pop(report_id, None)
+
+
+@app.route('/status/<report_id>')
+def get_status(report_id):
+    """Get the status of an analysis job."""
+    job = analysis_jobs.get(report_id)
+    if job is not None and not job.done():
+        return jsonify({'report_id': report_id, 'status': 'pending'}), 202
+    
+    with failed_jobs_lock:
+        error = failed_jobs.get(report_id)
+    if error is not None:
+        return jsonify({'report_id': report_id, 'status': 'failed', 'error': error}), 500
+    
+    report = analysis_results.get(report_id)
+    if not report:
+        return jsonify({'error': 'Report not found'}), 404
+    
+    return jsonify({
+        'success': True,
+        'report_id': report_id,
+        'status': 'done',
+        'report': report
+    })
 
 
 @app.route('/results/<report_id>')
@@ -185,7 +273,8 @@ def submit_to_bpa(report_id):
 @app.route('/history')
 def history():
     """View analysis history."""
-    return render_template('history.html', results=analysis_results)
+    results = dict(analysis_results.items(limit=Config.HISTORY_LIMIT))
+    return render_template('history.html', results=results)
 
 
 @app.route('/uploads/<filename>')
@@ -225,6 +314,7 @@ if __name__ == '__main__':
     print("\n📋 Before running:")
     print("   1. Create a .env file with your GEMINI_API_KEY")
     print("   2. Get your API key from: https://aistudio.google.com/apikey")
+    print("\n🏭 For production, run: gunicorn -c gunicorn_conf.py app:app")
     print("\n" + "="*60 + "\n")
     
     app.run(debug=True, port=5000)
@@ -7,6 +7,100 @@ from config import Config
 from typing import Dict, List, Optional
 from datetime import datetime
 import json
+import secrets
+import time
+
+
+# Anchor descriptions for scores 1, 5 and 9 of each trait
+_SCORE_ANCHORS = {
+    'stature': {
+        1: 'Very short/small',
+        5: 'Average height',
+        9: 'Very tall/large'
+    },
+    'chest_width': {
+        1: 'Very narrow chest',
+        5: 'Average chest width',
+        9: 'Very wide chest'
+    },
+    'body_depth': {
+        1: 'Very shallow body',
+        5: 'Average body depth',
+        9: 'Very deep body'
+    },
+    'rump_angle': {
+        1: 'Pins very high (level)',
+        5: 'Moderate slope',
+        9: 'Pins very low (steep)'
+    },
+    'rump_width': {
+        1: 'Very narrow rump',
+        5: 'Average rump width',
+        9: 'Very wide rump'
+    },
+    'rear_legs': {
+        1: 'Very straight (post-legged)',
+        5: 'Intermediate set',
+        9: 'Very sickled'
+    },
+    'foot_angle': {
+        1: 'Very low angle (flat)',
+        5: 'Intermediate angle',
+        9: 'Very steep angle'
+    },
+    'body_condition': {
+        1: 'Very thin/emaciated',
+        5: 'Average condition',
+        9: 'Very fat/over-conditioned'
+    },
+    'fore_udder': {
+        1: 'Weak/loose attachment',
+        5: 'Moderate attachment',
+        9: 'Very strong attachment'
+    },
+    'rear_udder_height': {
+        1: 'Very low attachment',
+        5: 'Intermediate height',
+        9: 'Very high attachment'
+    },
+    'udder_depth': {
+        1: 'Well below hocks',
+        5: 'At hock level',
+        9: 'Well above hocks'
+    },
+    'teat_placement': {
+        1: 'Very wide (outside)',
+        5: 'Central placement',
+        9: 'Very close (inside)'
+    },
+    'teat_length': {
+        1: 'Very short teats',
+        5: 'Medium length',
+        9: 'Very long teats'
+    }
+}
+
+
+def _describe_score(trait_desc: Dict[int, str], score: int) -> str:
+    """Describe a score from a trait's anchors, banding scores between them."""
+    if score in trait_desc:
+        return trait_desc[score]
+    elif score < 5:
+        return f"Below average ({trait_desc[1]} to {trait_desc[5]})"
+    else:
+        return f"Above average ({trait_desc[5]} to {trait_desc[9]})"
+
+
+def _build_score_descriptions(anchors: Dict[str, Dict[int, str]]) -> Dict[tuple, str]:
+    """Flatten the anchor descriptions into a (trait_id, score) lookup table."""
+    return {
+        (trait_id, score): _describe_score(trait_desc, score)
+        for trait_id, trait_desc in anchors.items()
+        for score in range(Config.SCORE_MIN, Config.SCORE_MAX + 1)
+    }
+
+
+_SCORE_DESCRIPTIONS = _build_score_descriptions(_SCORE_ANCHORS)
 
 
 class ATCScorer:
@@ -17,6 +111,12 @@ class ATCScorer:
         self.traits = Config.ATC_TRAITS
         self.score_min = Config.SCORE_MIN
         self.score_max = Config.SCORE_MAX
+        
+        # Trait definitions indexed by category and trait ID
+        self._trait_index = {
+            category: {t['id']: t for t in traits}
+            for category, traits in self.traits.items()
+        }
     
     def validate_score(self, score: int) -> bool:
         """Validate that a score is within the valid range.
@@ -41,85 +141,15 @@ class ATCScorer:
         Returns:
             Description of what the score means.
         """
-        descriptions = {
-            'stature': {
-                1: 'Very short/small',
-                5: 'Average height',
-                9: 'Very tall/large'
-            },
-            'chest_width': {
-                1: 'Very narrow chest',
-                5: 'Average chest width',
-                9: 'Very wide chest'
-            },
-            'body_depth': {
-                1: 'Very shallow body',
-                5: 'Average body depth',
-                9: 'Very deep body'
-            },
-            'rump_angle': {
-                1: 'Pins very high (level)',
-                5: 'Moderate slope',
-                9: 'Pins very low (steep)'
-            },
-            'rump_width': {
-                1: 'Very narrow rump',
-                5: 'Average rump width',
-                9: 'Very wide rump'
-            },
-            'rear_legs': {
-                1: 'Very straight (post-legged)',
-                5: 'Intermediate set',
-                9: 'Very sickled'
-            },
-            'foot_angle': {
-                1: 'Very low angle (flat)',
-                5: 'Intermediate angle',
-                9: 'Very steep angle'
-            },
-            'body_condition': {
-                1: 'Very thin/emaciated',
-                5: 'Average condition',
-                9: 'Very fat/over-conditioned'
-            },
-            'fore_udder': {
-                1: 'Weak/loose attachment',
-                5: 'Moderate attachment',
-                9: 'Very strong attachment'
-            },
-            'rear_udder_height': {
-                1: 'Very low attachment',
-                5: 'Intermediate height',
-                9: 'Very high attachment'
-            },
-            'udder_depth': {
-                1: 'Well below hocks',
-                5: 'At hock level',
-                9: 'Well above hocks'
-            },
-            'teat_placement': {
-                1: 'Very wide (outside)',
-                5: 'Central placement',
-                9: 'Very close (inside)'
-            },
-            'teat_length': {
-                1: 'Very short teats',
-                5: 'Medium length',
-                9: 'Very long teats'
-            }
-        }
+        description = _SCORE_DESCRIPTIONS.get((trait_id, score))
+        if description is not None:
+            return description
         
-        if trait_id not in descriptions:
+        # Scores outside the 1-9 table fall back to the nearest band
+        anchors = _SCORE_ANCHORS.get(trait_id)
+        if anchors is None:
             return f"Score: {score}"
-        
-        trait_desc = descriptions[trait_id]
-        
-        if score in trait_desc:
-            return trait_desc[score]
-        elif score < 5:
-            return f"Below average ({trait_desc[1]} to {trait_desc[5]})"
-        else:
-            return f"Above average ({trait_desc[5]} to {trait_desc[9]})"
+        return _describe_score(anchors, score)
     
     def calculate_overall_grade(self, composite_score: float) -> str:
         """Calculate an overall grade based on composite score.
@@ -145,17 +175,26 @@ class ATCScorer:
         else:
             return "Poor"
     
-    def format_report(self, analysis_result: dict) -> dict:
+    def new_report_id(self) -> str:
+        """Generate a unique report ID.
+        
+        Returns:
+            Millisecond timestamp followed by a random URL-safe suffix.
+        """
+        return f"{int(time.time() * 1000):013d}-{secrets.token_urlsafe(6)}"
+    
+    def format_report(self, analysis_result: dict, report_id: Optional[str] = None) -> dict:
         """Format analysis results into a comprehensive report.
         
         Args:
             analysis_result: Raw analysis result from Gemini analyzer.
+            report_id: Optional report ID. Generated if not provided.
             
         Returns:
             Formatted report dictionary.
         """
         report = {
-            "report_id": datetime.now().strftime("%Y%m%d%H%M%S"),
+            "report_id": report_id or self.new_report_id(),
             "generated_at": datetime.now().isoformat(),
             "animal_info": {
                 "type": analysis_result.get("animal_type", "unknown"),
@@ -200,7 +239,7 @@ class ATCScorer:
         formatted = []
         
         # Get trait definitions for this category
-        trait_defs = {t['id']: t for t in self.traits.get(category, [])}
+        trait_defs = self._trait_index.get(category, {})
         
         for trait_id, data in scores.items():
             if isinstance(data, dict):
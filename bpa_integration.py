@@ -3,7 +3,14 @@ BPA (Bharat Pashudhan App) Integration Module.
 Handles API communication with the BPA system.
 """
 
+import gzip
+import hashlib
+import threading
+import cachetools
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import logging
 from typing import Optional
@@ -14,6 +21,9 @@ from datetime import datetime
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Request bodies larger than this are gzip-compressed
+GZIP_MIN_SIZE = 1024
+
 
 class BPAIntegration:
     """Handles integration with Bharat Pashudhan App API."""
@@ -28,6 +38,29 @@ class BPAIntegration:
         self.api_url = api_url or Config.BPA_API_URL
         self.api_key = api_key or Config.BPA_API_KEY
         self.is_configured = bool(self.api_url and self.api_key)
+        
+        # Pooled session so connections and TLS sessions are reused
+        self._session = requests.Session()
+        self._session.headers.update({
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        })
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=20,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[502, 503, 504],
+                raise_on_status=False
+            )
+        )
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        
+        # Successful submissions keyed by content hash, so retries are not resent
+        self._submission_cache = cachetools.TTLCache(maxsize=512, ttl=3600)
+        self._cache_lock = threading.Lock()
     
     def submit_classification(self, data: dict) -> dict:
         """Submit ATC classification data to BPA.
@@ -45,25 +78,35 @@ class BPAIntegration:
                 "data": None
             }
         
+        key = self._submission_key(data)
+        with self._cache_lock:
+            cached = self._submission_cache.get(key)
+        if cached is not None:
+            return cached
+        
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
+            body = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+            headers = {}
+            if len(body) > GZIP_MIN_SIZE:
+                body = gzip.compress(body)
+                headers["Content-Encoding"] = "gzip"
             
-            response = requests.post(
+            response = self._session.post(
                 self.api_url,
+                data=body,
                 headers=headers,
-                json=data,
                 timeout=30
             )
             
             if response.status_code == 200:
-                return {
+                result = {
                     "success": True,
                     "message": "Data successfully submitted to BPA",
                     "data": response.json()
                 }
+                with self._cache_lock:
+                    self._submission_cache[key] = result
+                return result
             else:
                 return {
                     "success": False,
@@ -86,6 +129,19 @@ class BPAIntegration:
                 "data": None
             }
     
+    def _submission_key(self, data: dict) -> str:
+        """Hash submission content, ignoring the per-call submission timestamp.
+        
+        Args:
+            data: BPA-formatted classification data.
+            
+        Returns:
+            Hex digest identifying the submission content.
+        """
+        content = {k: v for k, v in data.items() if k != "submission_timestamp"}
+        body = orjson.dumps(content, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        return hashlib.blake2b(body, digest_size=16).hexdigest()
+    
     def check_connection(self) -> dict:
         """Check if BPA API is reachable.
         
@@ -100,7 +156,7 @@ class BPAIntegration:
         
         try:
             # Try a simple health check (if available)
-            response = requests.get(
+            response = self._session.get(
                 self.api_url.replace('/atc', '/health'),
                 timeout=10
             )
@@ -1,9 +1,12 @@
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+BASE_DIR = Path(__file__).resolve().parent
+
 class Config:
     """Application configuration."""
     
@@ -13,12 +16,27 @@ class Config:
     # Gemini API
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY', '')
     GEMINI_MODEL = 'gemini-2.5-flash'
+    GEMINI_IMAGE_MAX_SIZE = (1024, 1024)  # Images are downscaled to fit before upload
+    GEMINI_IMAGE_QUALITY = 85  # JPEG quality used when re-encoding
+    GEMINI_CACHE_SIZE = 1024  # Analyses cached by image fingerprint
+    GEMINI_CACHE_TTL = 24 * 3600  # 24 hours
+    GEMINI_TIMEOUT = 90  # Seconds before a Gemini request is abandoned
+    ANALYSIS_WORKERS = int(os.getenv('ATC_WORKERS', 8))
+    MAX_PENDING_JOBS = int(os.getenv('ATC_MAX_PENDING_JOBS', 32))  # Uploads beyond this get a 503
     
     # File Upload
-    UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), 'uploads')
+    UPLOAD_FOLDER = BASE_DIR / 'uploads'
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max
+    MAX_FORM_MEMORY_SIZE = 512 * 1024  # 512KB max for non-file form fields
+    UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB copy buffer when saving uploads
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'webp'}
     
+    # Report Storage
+    REPORT_DB_PATH = Path(os.getenv('REPORT_DB_PATH', BASE_DIR / 'reports.db'))
+    REPORT_CACHE_SIZE = int(os.getenv('REPORT_CACHE_SIZE', 128))
+    REPORT_MAX_ENTRIES = int(os.getenv('REPORT_MAX_ENTRIES', 1000))
+    HISTORY_LIMIT = int(os.getenv('HISTORY_LIMIT', 100))  # Newest reports shown on /history
+    
     # BPA Integration
     BPA_API_URL = os.getenv('BPA_API_URL', '')
     BPA_API_KEY = os.getenv('BPA_API_KEY', '')
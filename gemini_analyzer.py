@@ -3,55 +3,27 @@ Gemini Vision API Analyzer for Animal Type Classification.
 This module handles image analysis using Google's Gemini Vision API.
 """
 
-import google.generativeai as genai
-from PIL import Image
-import json
+import numpy as np
+import cachetools
+import copy
+import io
+import orjson
 import os
+import re
+import threading
+from concurrent.futures import Future
+from typing import ClassVar, Optional, Tuple
 from config import Config
 
+# Markdown code fence wrapped around a JSON response
+_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*\n?(.*?)\n?\s*```\s*$', re.DOTALL)
+
 
 class GeminiAnalyzer:
     """Analyzes animal images using Gemini Vision API."""
     
-    def __init__(self, api_key: str = None):
-        """Initialize the Gemini analyzer.
-        
-        Args:
-            api_key: Gemini API key. If not provided, uses environment variable.
-        """
-        self.api_key = api_key or Config.GEMINI_API_KEY
-        if not self.api_key:
-            raise ValueError("Gemini API key is required. Set GEMINI_API_KEY in .env file.")
-        
-        genai.configure(api_key=self.api_key)
-        self.model = genai.GenerativeModel(Config.GEMINI_MODEL)
-    
-    def analyze_image(self, image_path: str) -> dict:
-        """Analyze an animal image and return ATC scores.
-        
-        Args:
-            image_path: Path to the animal image.
-            
-        Returns:
-            Dictionary containing analysis results and ATC scores.
-        """
-        # Load and validate image
-        image = Image.open(image_path)
-        
-        # Create the analysis prompt
-        prompt = self._create_analysis_prompt()
-        
-        # Send to Gemini for analysis
-        response = self.model.generate_content([prompt, image])
-        
-        # Parse the response
-        result = self._parse_response(response.text)
-        
-        return result
-    
-    def _create_analysis_prompt(self) -> str:
-        """Create the analysis prompt for Gemini."""
-        return """You are an expert animal type classifier (ATC) for cattle and buffalo evaluation. 
+    # Analysis prompt sent with every image
+    PROMPT: ClassVar[str] = """You are an expert animal type classifier (ATC) for cattle and buffalo evaluation. 
 Analyze this image and provide a detailed assessment.
 
 IMPORTANT: Respond ONLY with a valid JSON object, no other text.
@@ -102,7 +74,158 @@ Return this exact JSON structure:
 If no animal is detected, set animal_detected to false and provide empty/null values for other fields.
 If a trait cannot be assessed from the image angle, set its score to null with appropriate notes.
 """
-
+    
+    def __init__(self, api_key: str = None):
+        """Initialize the Gemini analyzer.
+        
+        Args:
+            api_key: Gemini API key. If not provided, uses environment variable.
+        """
+        self.api_key = api_key or Config.GEMINI_API_KEY
+        if not self.api_key:
+            raise ValueError("Gemini API key is required. Set GEMINI_API_KEY in .env file.")
+        
+        # Imported lazily: the SDK pulls in protobuf/grpc and slows app startup
+        import google.generativeai as genai
+        
+        self._genai = genai
+        genai.configure(api_key=self.api_key)
+        self.model = genai.GenerativeModel(Config.GEMINI_MODEL)
+        self._generate = self.model.generate_content
+        
+        # Recent analyses keyed by image fingerprint
+        self._cache = cachetools.TTLCache(
+            maxsize=Config.GEMINI_CACHE_SIZE, ttl=Config.GEMINI_CACHE_TTL
+        )
+        self._cache_lock = threading.Lock()
+        
+        # Analyses currently running, so duplicates wait instead of calling again
+        self._in_flight = {}
+    
+    def analyze_image(self, image_path: str) -> dict:
+        """Analyze an animal image and return ATC scores.
+        
+        Args:
+            image_path: Path to the animal image.
+            
+        Returns:
+            Dictionary containing analysis results and ATC scores.
+        """
+        # Load, downscale and re-encode the image
+        image, fingerprint = self._prepare_image(image_path)
+        
+        # Featureless images have no usable fingerprint; always analyze them
+        if fingerprint is None:
+            return self._request_analysis(image)
+        
+        # Reuse the analysis of an identical image, or join one in progress
+        with self._cache_lock:
+            cached = self._cache.get(fingerprint)
+            pending = self._in_flight.get(fingerprint)
+            is_owner = cached is None and pending is None
+            if is_owner:
+                pending = self._in_flight[fingerprint] = Future()
+        if cached is not None:
+            return copy.deepcopy(cached)
+        if not is_owner:
+            return copy.deepcopy(pending.result())
+        
+        try:
+            result = self._request_analysis(image)
+            
+            if not result.get("error"):
+                with self._cache_lock:
+                    self._cache[fingerprint] = copy.deepcopy(result)
+            
+            pending.set_result(copy.deepcopy(result))
+        except Exception as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._cache_lock:
+                self._in_flight.pop(fingerprint, None)
+        
+        return result
+    
+    def _request_analysis(self, image: dict) -> dict:
+        """Send a prepared image to Gemini and parse the response.
+        
+        Args:
+            image: Inline image part from _prepare_image.
+            
+        Returns:
+            Dictionary containing analysis results and ATC scores.
+        """
+        response = self._generate(
+            [self.PROMPT, image],
+            request_options={"timeout": Config.GEMINI_TIMEOUT}
+        )
+        return self._parse_response(response.text)
+    
+    def _prepare_image(self, image_path: str) -> Tuple[dict, Optional[str]]:
+        """Downscale an image and re-encode it as JPEG for upload.
+        
+        Args:
+            image_path: Path to the animal image.
+            
+        Returns:
+            Inline image part for the Gemini request, and a fingerprint of
+            the image content used as the analysis cache key (None if the
+            image is too featureless to fingerprint safely).
+        """
+        from PIL import Image, ImageOps
+        
+        with Image.open(image_path) as image:
+            # Let the JPEG decoder skip detail we are about to throw away
+            image.draft('RGB', Config.GEMINI_IMAGE_MAX_SIZE)
+            
+            # Re-encoding drops EXIF, so apply the orientation to the pixels
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail(Config.GEMINI_IMAGE_MAX_SIZE, Image.Resampling.LANCZOS)
+            
+            # Flatten transparent PNG/WebP images onto white
+            if image.mode in ('RGBA', 'LA') or 'transparency' in image.info:
+                rgba = image.convert('RGBA')
+                image = Image.new('RGB', rgba.size, (255, 255, 255))
+                image.paste(rgba, mask=rgba.getchannel('A'))
+            else:
+                image = image.convert('RGB')
+            
+            buffer = io.BytesIO()
+            image.save(buffer, 'JPEG', quality=Config.GEMINI_IMAGE_QUALITY, optimize=True)
+            
+            fingerprint = self._difference_hash(image)
+        
+        return {"mime_type": "image/jpeg", "data": buffer.getvalue()}, fingerprint
+    
+    def _difference_hash(self, image, hash_size: int = 16) -> Optional[str]:
+        """Compute a perceptual difference hash (dHash) of an image.
+        
+        Each bit records whether a pixel of a small grayscale thumbnail is
+        brighter than its left neighbour. Re-encoded or resized copies of an
+        image usually produce the same hash, though a bit can still flip when
+        two neighbouring pixels are nearly equal.
+        
+        Flat or very low-contrast images set almost no bits (a black and a
+        white image both hash to zeros), so hashes with too few or too many
+        bits set are rejected rather than shared between unrelated images.
+        
+        Args:
+            image: PIL image.
+            hash_size: Rows of the thumbnail; the hash has hash_size**2 bits.
+            
+        Returns:
+            Hex string of the hash, or None if the hash is degenerate.
+        """
+        small = image.convert('L').resize((hash_size + 1, hash_size))
+        pixels = np.asarray(small, dtype=np.int16)
+        bits = pixels[:, 1:] > pixels[:, :-1]
+        
+        min_bits = bits.size // 16
+        if not min_bits <= np.count_nonzero(bits) <= bits.size - min_bits:
+            return None
+        return np.packbits(bits).tobytes().hex()
+    
     def _parse_response(self, response_text: str) -> dict:
         """Parse the Gemini response into a structured result.
         
@@ -114,23 +237,17 @@ If a trait cannot be assessed from the image angle, set its score to null with a
         """
         try:
             # Clean up the response (remove markdown code blocks if present)
-            text = response_text.strip()
-            if text.startswith('```json'):
-                text = text[7:]
-            if text.startswith('```'):
-                text = text[3:]
-            if text.endswith('```'):
-                text = text[:-3]
-            text = text.strip()
+            match = _FENCE_RE.match(response_text)
+            text = match.group(1) if match else response_text.strip()
             
-            result = json.loads(text)
+            result = orjson.loads(text)
             
             # Validate and ensure all required fields exist
             result = self._validate_result(result)
             
             return result
             
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             # Return error response if parsing fails
             return {
                 "error": True,
@@ -185,20 +302,12 @@ If a trait cannot be assessed from the image angle, set its score to null with a
         udder = result.get("udder_scores", {})
         
         # Calculate structural composite
-        structural_scores = []
-        for trait, data in structural.items():
-            if isinstance(data, dict) and data.get("score") is not None:
-                structural_scores.append(data["score"])
-        
-        structural_avg = sum(structural_scores) / len(structural_scores) if structural_scores else 5
+        structural_scores = self._collect_scores(structural)
+        structural_avg = float(structural_scores.mean()) if structural_scores.size else 5
         
         # Calculate udder composite
-        udder_scores = []
-        for trait, data in udder.items():
-            if isinstance(data, dict) and data.get("score") is not None:
-                udder_scores.append(data["score"])
-        
-        udder_avg = sum(udder_scores) / len(udder_scores) if udder_scores else None
+        udder_scores = self._collect_scores(udder)
+        udder_avg = float(udder_scores.mean()) if udder_scores.size else None
         
         # Calculate final composite
         if udder_avg is not None:
@@ -211,3 +320,29 @@ If a trait cannot be assessed from the image angle, set its score to null with a
             "udder_composite": round(udder_avg, 2) if udder_avg else None,
             "final_composite": round(final, 2)
         }
+    
+    def _collect_scores(self, traits: dict) -> np.ndarray:
+        """Collect the numeric trait scores of a category into an array.
+        
+        Null scores are skipped. Any other non-numeric score (a string or a
+        bool) raises, as summing it did before, rather than being coerced
+        into a plausible-looking number.
+        
+        Args:
+            traits: Dictionary of trait score entries.
+            
+        Returns:
+            1-D float array of scores.
+            
+        Raises:
+            TypeError: If a score is neither null nor a number.
+        """
+        scores = []
+        for trait, data in traits.items():
+            if not isinstance(data, dict) or data.get("score") is None:
+                continue
+            score = data["score"]
+            if isinstance(score, bool) or not isinstance(score, (int, float)):
+                raise TypeError(f"Invalid score for {trait}: {score!r}")
+            scores.append(score)
+        return np.array(scores, dtype=np.float64)
@@ -0,0 +1,19 @@
+"""
+Gunicorn configuration for production deployments.
+
+Run with: gunicorn -c gunicorn_conf.py app:app
+"""
+
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+
+# Threaded workers suit the I/O-bound upload and Gemini workload.
+# Pending analysis jobs are tracked per process, so keep a single worker
+# unless requests are pinned to workers (status polls must reach the same one).
+worker_class = 'gthread'
+workers = int(os.getenv('GUNICORN_WORKERS', 1))
+threads = int(os.getenv('GUNICORN_THREADS', 16))
+
+# Gemini analysis can take a while; leave headroom for slow uploads
+timeout = 120
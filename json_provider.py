@@ -0,0 +1,50 @@
+"""
+JSON Provider Module.
+Serializes Flask JSON responses with orjson.
+"""
+
+import orjson
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson.
+
+    Types orjson does not handle natively (Decimal, objects with __html__,
+    dates formatted as HTTP dates, ...) fall back to
+    DefaultJSONProvider.default. Keys are sorted like the stock provider,
+    but output is always compact and non-ASCII characters are written as
+    UTF-8 rather than escaped.
+    """
+
+    sort_keys = True
+
+    def dumps(self, obj, **kwargs) -> str:
+        """Serialize data as JSON.
+
+        Args:
+            obj: Data to serialize.
+            **kwargs: ``default``, ``sort_keys`` and ``indent`` are honoured;
+                orjson only supports an indent of two spaces.
+
+        Returns:
+            JSON string.
+        """
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        default = kwargs.get("default", DefaultJSONProvider.default)
+        return orjson.dumps(obj, default=default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        """Deserialize data as JSON.
+
+        Args:
+            s: JSON text or bytes.
+
+        Returns:
+            Deserialized data.
+        """
+        return orjson.loads(s)
@@ -0,0 +1,179 @@
+"""
+Report Storage Module.
+Keeps analysis reports in a bounded in-memory LRU backed by SQLite.
+"""
+
+import orjson
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterator, List, Optional, Tuple
+
+
+class ReportStore:
+    """Bounded LRU cache of reports persisted to a SQLite database."""
+
+    def __init__(self, db_path: str, cache_size: int = 128, max_entries: int = 1000,
+                 on_evict: Optional[Callable[[str, dict], None]] = None):
+        """Initialize the report store.
+
+        Args:
+            db_path: Path to the SQLite database file.
+            cache_size: Number of reports kept in memory.
+            max_entries: Number of reports kept on disk before the oldest are evicted.
+            on_evict: Optional callback called with (report_id, report) for each
+                evicted report, e.g. to remove files it references.
+        """
+        self.cache_size = cache_size
+        self.max_entries = max_entries
+        self.on_evict = on_evict
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS reports ("
+            "report_id TEXT PRIMARY KEY, "
+            "created_at REAL NOT NULL, "
+            "data BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, report_id: str, default: Optional[dict] = None) -> Optional[dict]:
+        """Get a report by ID.
+
+        Args:
+            report_id: ID of the report.
+            default: Value returned if the report does not exist.
+
+        Returns:
+            Report dictionary, or default if not found.
+        """
+        with self._lock:
+            report = self._cache.get(report_id)
+            if report is not None:
+                self._cache.move_to_end(report_id)
+                return report
+
+            row = self._conn.execute(
+                "SELECT data FROM reports WHERE report_id = ?", (report_id,)
+            ).fetchone()
+            if row is None:
+                return default
+
+            report = orjson.loads(row[0])
+            self._remember(report_id, report)
+            return report
+
+    def put(self, report_id: str, report: dict) -> None:
+        """Store a report, evicting the oldest ones beyond the size limits.
+
+        Args:
+            report_id: ID of the report.
+            report: Report dictionary to store.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO reports (report_id, created_at, data) VALUES (?, ?, ?)",
+                (report_id, time.time(), orjson.dumps(report))
+            )
+            evicted = self._prune()
+            self._conn.commit()
+            self._remember(report_id, report)
+        self._notify_evicted(evicted)
+
+    def setdefault(self, report_id: str, report: dict) -> dict:
+        """Store a report only if its ID is not already taken.
+
+        Args:
+            report_id: ID of the report.
+            report: Report dictionary to store.
+
+        Returns:
+            The report stored under the ID, which is the existing one on collision.
+        """
+        existing = self.get(report_id)
+        if existing is not None:
+            return existing
+
+        evicted = []
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO reports (report_id, created_at, data) VALUES (?, ?, ?)",
+                (report_id, time.time(), orjson.dumps(report))
+            )
+            if cursor.rowcount == 0:
+                row = self._conn.execute(
+                    "SELECT data FROM reports WHERE report_id = ?", (report_id,)
+                ).fetchone()
+                report = orjson.loads(row[0])
+            else:
+                evicted = self._prune()
+            self._conn.commit()
+            self._remember(report_id, report)
+        self._notify_evicted(evicted)
+        return report
+
+    def items(self, limit: Optional[int] = None) -> Iterator[Tuple[str, dict]]:
+        """Iterate over stored reports, oldest first.
+
+        Args:
+            limit: If given, only the newest `limit` reports are returned.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT report_id, data FROM reports "
+                "ORDER BY created_at DESC, rowid DESC LIMIT ?",
+                (-1 if limit is None else limit,)
+            ).fetchall()
+        for report_id, data in reversed(rows):
+            yield report_id, orjson.loads(data)
+
+    def _prune(self) -> List[Tuple[str, bytes]]:
+        """Delete the oldest reports beyond max_entries, on disk and in memory.
+
+        Returns:
+            (report_id, data) rows of the evicted reports.
+        """
+        evicted = self._conn.execute(
+            "SELECT report_id, data FROM reports "
+            "ORDER BY created_at DESC, rowid DESC LIMIT -1 OFFSET ?",
+            (self.max_entries,)
+        ).fetchall()
+        self._conn.executemany(
+            "DELETE FROM reports WHERE report_id = ?",
+            [(report_id,) for report_id, _ in evicted]
+        )
+        for report_id, _ in evicted:
+            self._cache.pop(report_id, None)
+        return evicted
+
+    def _notify_evicted(self, evicted: List[Tuple[str, bytes]]) -> None:
+        """Pass evicted reports to the on_evict callback, outside the lock."""
+        if self.on_evict is None:
+            return
+        for report_id, data in evicted:
+            self.on_evict(report_id, orjson.loads(data))
+
+    def _remember(self, report_id: str, report: dict) -> None:
+        """Insert a report into the in-memory LRU, evicting the least recently used."""
+        self._cache[report_id] = report
+        self._cache.move_to_end(report_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def __getitem__(self, report_id: str) -> dict:
+        report = self.get(report_id)
+        if report is None:
+            raise KeyError(report_id)
+        return report
+
+    def __setitem__(self, report_id: str, report: dict) -> None:
+        self.put(report_id, report)
+
+    def __contains__(self, report_id: str) -> bool:
+        return self.get(report_id) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
@@ -18,6 +18,10 @@ document.addEventListener('DOMContentLoaded', function() {
     let selectedFile = null;
     let currentReportId = null;
 
+    // Status polling for background analysis
+    const STATUS_POLL_INTERVAL = 1500;
+    const MAX_STATUS_POLLS = 120;
+
     // ========== Upload Handling ==========
     
     // Click to upload
@@ -127,12 +131,27 @@ document.addEventListener('DOMContentLoaded', function() {
                     body: formData
                 });
 
-                const data = await response.json();
+                let data = await response.json();
 
                 if (data.error) {
                     throw new Error(data.error);
                 }
 
+                // Poll until the background analysis finishes (give up after ~3 minutes)
+                let polls = 0;
+                while (data.status === 'pending') {
+                    if (++polls > MAX_STATUS_POLLS) {
+                        throw new Error('Analysis timed out. Please try again.');
+                    }
+                    await new Promise(resolve => setTimeout(resolve, STATUS_POLL_INTERVAL));
+                    const statusResponse = await fetch(`/status/${data.report_id}`);
+                    data = await statusResponse.json();
+
+                    if (data.error) {
+                        throw new Error(data.error);
+                    }
+                }
+
                 // Store report ID
                 currentReportId = data.report_id;
 